@@ -13,8 +13,13 @@
 # Course: https://sps-lab.org/courses/een452/
 
 # Import required libraries
+import matplotlib                # Plotting library
+matplotlib.use('Agg')            # Non-interactive backend, the plots are saved to a file
+import matplotlib.pyplot as plt
 import pyramses  # Main PyRAMSES simulation engine
-import os        # For file operations
+import copy      # For copying the case
+import pathlib   # For file paths
+import shutil    # For file operations
 
 # ============================================================================
 # STEP 1: CONFIGURE THE SIMULATION CASE
@@ -27,167 +32,217 @@ print("Step 1: Configuring simulation case...")
 # Create a new simulation configuration object
 case = pyramses.cfg()
 
-# Add output files for simulation results and debugging
-case.addOut('output.trace')      # Main simulation log file - contains detailed execution info
-case.addData('dyn_B.dat')        # Dynamic data file - contains generator models, controllers, network topology
-case.addData('volt_rat_B.dat')   # Power flow solution - initial voltage magnitudes and angles at all buses
-case.addData('settings1.dat')    # Solver settings - numerical integration parameters, tolerances
-case.addInit('init.trace')       # Initialization log - shows how the system reaches steady state
-case.addDst('nothing.dst')       # Disturbance file - defines events to occur during simulation (empty = no events)
-case.addCont('cont.trace')       # Continuous variables trace - time evolution of state variables
-case.addDisc('disc.trace')       # Discrete events trace - records of switching events, breaker operations
-case.addObs('obs.dat')           # Observation file - defines which variables to monitor and save
-case.addTrj('output.trj')        # Trajectory file - main output containing all simulation results
+# Add all the input files of the case in one go
+# (the output files depend on the scenario, they are added in run_trip() below)
+case.addFiles({
+    'data': ['dyn_B.dat',                   # Dynamic data file - contains generator models, controllers, network topology
+             'volt_rat_B.dat',              # Power flow solution - initial voltage magnitudes and angles at all buses
+             'settings1.dat'],              # Solver settings - numerical integration parameters, tolerances
+    'dst': 'nothing.dst',                   # Disturbance file - defines events to occur during simulation (empty = no events)
+    'cont': None,                           # Continuous trace - solver convergence log, not needed here (slows the simulation)
+    'disc': None,                           # Discrete events trace - switching events, breaker operations, not needed here
+    'obs': 'obs.dat',                       # Observation file - defines which variables to monitor and save
+})
 
 # ============================================================================
-# STEP 2: CLEAN UP PREVIOUS SIMULATION FILES
+# STEPS 2-8: SIMULATE A GENERATOR TRIP
 # ============================================================================
-# Remove any existing output files from previous runs to avoid confusion
-# This ensures we start with a clean slate
+# The simulation is wrapped in a function, so that it can be repeated for
+# different generators and times (e.g., in a contingency study) while the
+# case configured above is reused. A new simulator is created at every call,
+# as RAMSES offers no way to reset a simulator while keeping the loaded data.
+# Each scenario writes its outputs in its own directory, so that the calls
+# (sequential or in parallel) do not overwrite each other's results.
+
+def run_trip(gen='g7', t_trip=10.0, t_end=150.0):
+    """Simulate the trip of generator gen at t_trip until t_end and plot the response of g5.
+
+    Returns the extractor of the trajectory, or None if the simulation failed.
+    """
+    # ============================================================================
+    # STEP 2: PREPARE THE OUTPUT FILES
+    # ============================================================================
+    # Remove any existing output files from previous runs of the same scenario
+    # to avoid confusion. This ensures we start with a clean slate
+
+    print("Step 2: Preparing the output files...")
+
+    # All the outputs of the scenario live in their own directory, so it is
+    # removed as a whole instead of scanning for .trace and .trj files
+    run_dir = pathlib.Path(f'run_{gen}_{t_trip:g}_{t_end:g}')
+    if run_dir.exists():
+        shutil.rmtree(run_dir)
+        print(f"  Removed: {run_dir}")
+    run_dir.mkdir()
+
+    # The output files are added to a copy of the case, the shared case is left untouched
+    trip_case = copy.deepcopy(case)
+    trip_case.addFiles({
+        'out': str(run_dir / 'output.trace'),   # Main simulation log file - contains detailed execution info
+        'init': str(run_dir / 'init.trace'),    # Initialization log - shows how the system reaches steady state
+        'trj': str(run_dir / 'output.trj'),     # Trajectory file - main output containing all simulation results
+    })
+
+    # ============================================================================
+    # STEP 3: INITIALIZE THE SIMULATION
+    # ============================================================================
+    # Start the PyRAMSES simulator and initialize the system to steady state
+    # Reference: https://pyramses.sps-lab.org/interface/simul.html
+
+    print("Step 3: Initializing simulation...")
+
+    # Create simulation object
+    ram = pyramses.sim()
+
+    # Initialize the system at t=0.0 seconds
+    # This step:
+    # - Loads all data files
+    # - Performs power flow calculation
+    # - Initializes all dynamic models (generators, controllers, loads)
+    # - Verifies system stability at initial conditions
+    try:
+        ram.execSim(trip_case, 0.0)  # Initialize at time t=0.0
+        print("  Initialization successful!")
+    except pyramses.RAMSESError as e:
+        print("  Initialization failed!")
+        print(e)  # The error carries the last message issued by RAMSES
+        return None
+
+    # ============================================================================
+    # STEP 4: APPLY DISTURBANCE
+    # ============================================================================
+    # Simulate a generator trip event to demonstrate voltage collapse
+    # This is the key event that will trigger the dynamic response
+
+    print("Step 4: Applying disturbance...")
+
+    # Trip generator gen (default 'g7') at t=t_trip seconds (default 10.00)
+    # Command format: 'BREAKER SYNC_MACH [generator_name] [status]'
+    # - BREAKER: Type of switching action
+    # - SYNC_MACH: Component type (synchronous machine)
+    # - gen: Generator name from the data file
+    # - 0: Status (0 = open/off, 1 = closed/on)
+    # Events are collected first and passed to the simulator in a single call
+    t_dists = [t_trip]
+    disturbs = [f'BREAKER SYNC_MACH {gen} 0']
+    ram.addDisturbs(t_dists, disturbs)
+    print(f"  Generator {gen} will be tripped at t={t_trip:.2f} seconds")
+
+    # ============================================================================
+    # STEP 5: RUN THE DYNAMIC SIMULATION
+    # ============================================================================
+    # Simulate the system response from t=0 to t=t_end seconds (default 150)
+    # This captures the complete dynamic behavior following the disturbance
+
+    print("Step 5: Running dynamic simulation...")
+
+    try:
+        # Continue simulation until t=t_end seconds
+        # During this time, the system will:
+        # - Respond to the generator trip at t=t_trip
+        # - Show frequency and voltage dynamics
+        # - Demonstrate control system responses (governors, AVRs)
+        # - Potentially show voltage collapse if the system is unstable
+        ram.contSim(t_end)
+
+        # End simulation and finalize output files
+        ram.endSim()
+        print("  Simulation completed successfully!")
+    except pyramses.RAMSESError as e:
+        print("  Simulation failed!")
+        print(e)  # The error carries the last message issued by RAMSES
+        return None
+
+    # ============================================================================
+    # STEP 6: OPTIONAL - VIEW SIMULATION LOG
+    # ============================================================================
+    # Uncomment the line below to see detailed simulation log
+    # This can be useful for debugging or understanding what happened during simulation
+
+    print("Step 6: Simulation log (optional)...")
+    # Uncomment the next line to see the log:
+    # print(open(trip_case.getOut()).read())
+
+    # ============================================================================
+    # STEP 7: ANALYZE RESULTS
+    # ============================================================================
+    # Extract and plot key simulation results
+    # Reference: https://pyramses.sps-lab.org/interface/extractor.html
+
+    print("Step 7: Analyzing results...")
+
+    # Create extractor object to access simulation results
+    # This loads the trajectory file containing all time-series data
+    ext = pyramses.extractor(trip_case.getTrj())
+
+    # ============================================================================
+    # STEP 8: PLOT DYNAMIC RESPONSES
+    # ============================================================================
+    # Generate plots showing the system response to the disturbance
+    # We focus on generator g5 as a representative example
+
+    print("Step 8: Generating plots...")
+
+    # All six plots are drawn in a single figure with a 2x3 grid of axes
+    fig, axes = plt.subplots(2, 3, figsize=(15, 8))
+
+    # Plot 1: Frequency deviation (speed) of generator g5
+    # This shows how the system frequency responds to the loss of generation
+    # Expected: Initial drop followed by recovery due to governor action
+    print("  Plotting frequency deviation...")
+    ext.getSync('g5').S.plot(ax=axes.flat[0])
+
+    # Plot 2: Governor valve position for generator g5
+    # Shows the primary frequency control response
+    # Expected: Valve opens to increase mechanical power output
+    print("  Plotting governor valve position...")
+    ext.getTor('g5').z.plot(ax=axes.flat[1])
+
+    # Plot 3: Mechanical power output of generator g5 (per unit)
+    # Shows the turbine response to frequency deviation
+    # Expected: Power increases to help restore system frequency
+    print("  Plotting mechanical power...")
+    ext.getTor('g5').Pm.plot(ax=axes.flat[2])
+
+    # Plot 4: Electrical active power output of generator g5
+    # Shows the actual electrical power delivered to the grid
+    # Expected: Follows mechanical power with some dynamics
+    print("  Plotting electrical active power...")
+    ext.getSync('g5').P.plot(ax=axes.flat[3])
+
+    # Plot 5: Terminal voltage magnitude at generator g5
+    # Shows voltage stability response
+    # Expected: May show voltage drop and recovery, or collapse if system is unstable
+    print("  Plotting terminal voltage...")
+    ext.getBus('g5').mag.plot(ax=axes.flat[4])
+
+    # Plot 6: Electrical reactive power output of generator g5
+    # Shows reactive power dynamics and AVR response
+    # Expected: Reactive power may increase to support voltage
+    print("  Plotting electrical reactive power...")
+    ext.getSync('g5').Q.plot(ax=axes.flat[5])
+
+    # Save the figure with all the plots
+    fig.tight_layout()
+    fig.savefig(str(run_dir / 'g5_response.png'), dpi=100)
+    plt.close(fig)  # release the figure, the function may be called many times
+    print(f"  Plots saved in {run_dir / 'g5_response.png'}")
+
+    print("\n" + "="*80)
+    print("SIMULATION COMPLETED SUCCESSFULLY!")
+    print("="*80)
+
+    return ext
 
-print("Step 2: Cleaning up previous simulation files...")
 
-# Loop through all files in current directory
-for item in os.listdir('.'):
-    # Remove files with .trace or .trj extensions (simulation output files)
-    if item.endswith(('.trace', '.trj')):
-        os.remove(os.path.join('.', item))
-        print(f"  Removed: {item}")
-
-# ============================================================================
-# STEP 3: INITIALIZE THE SIMULATION
 # ============================================================================
-# Start the PyRAMSES simulator and initialize the system to steady state
-# Reference: https://pyramses.sps-lab.org/interface/simul.html
-
-print("Step 3: Initializing simulation...")
-
-# Create simulation object
-ram = pyramses.sim()
-
-# Initialize the system at t=0.0 seconds
-# This step:
-# - Loads all data files
-# - Performs power flow calculation
-# - Initializes all dynamic models (generators, controllers, loads)
-# - Verifies system stability at initial conditions
-try:
-    ram.execSim(case, 0.0)  # Initialize at time t=0.0
-    print("  Initialization successful!")
-except:
-    print("  Initialization failed!")
-    print(ram.getLastErr())  # Print any initialization errors
-
+# RUN THE TUTORIAL SCENARIO
 # ============================================================================
-# STEP 4: APPLY DISTURBANCE
-# ============================================================================
-# Simulate a generator trip event to demonstrate voltage collapse
-# This is the key event that will trigger the dynamic response
-
-print("Step 4: Applying disturbance...")
+# Trip generator g7 at t=10 s and simulate until t=150 s
 
-# Trip generator 'g7' at t=10.00 seconds
-# Command format: 'BREAKER SYNC_MACH [generator_name] [status]'
-# - BREAKER: Type of switching action
-# - SYNC_MACH: Component type (synchronous machine)
-# - g7: Generator name from the data file
-# - 0: Status (0 = open/off, 1 = closed/on)
-ram.addDisturb(10.00, 'BREAKER SYNC_MACH g7 0')
-print("  Generator g7 will be tripped at t=10.00 seconds")
+if __name__ == '__main__':
+    run_trip()
 
-# ============================================================================
-# STEP 5: RUN THE DYNAMIC SIMULATION
-# ============================================================================
-# Simulate the system response from t=0 to t=150 seconds
-# This captures the complete dynamic behavior following the disturbance
-
-print("Step 5: Running dynamic simulation...")
-
-try:
-    # Continue simulation until t=150.0 seconds
-    # During this time, the system will:
-    # - Respond to the generator trip at t=10s
-    # - Show frequency and voltage dynamics
-    # - Demonstrate control system responses (governors, AVRs)
-    # - Potentially show voltage collapse if the system is unstable
-    ram.contSim(150.0)
-    
-    # End simulation and finalize output files
-    ram.endSim()
-    print("  Simulation completed successfully!")
-except:
-    print("  Simulation failed!")
-    print(ram.getLastErr())  # Print any simulation errors
-
-# ============================================================================
-# STEP 6: OPTIONAL - VIEW SIMULATION LOG
-# ============================================================================
-# Uncomment the line below to see detailed simulation log
-# This can be useful for debugging or understanding what happened during simulation
-
-print("Step 6: Simulation log (optional)...")
-# Uncomment the next line to see the log:
-# print(open(case.getOut()).read())
-
-# ============================================================================
-# STEP 7: ANALYZE RESULTS
-# ============================================================================
-# Extract and plot key simulation results
-# Reference: https://pyramses.sps-lab.org/interface/extractor.html
-
-print("Step 7: Analyzing results...")
-
-# Create extractor object to access simulation results
-# This loads the trajectory file containing all time-series data
-ext = pyramses.extractor(case.getTrj())
-
-# ============================================================================
-# STEP 8: PLOT DYNAMIC RESPONSES
-# ============================================================================
-# Generate plots showing the system response to the disturbance
-# We focus on generator g5 as a representative example
-
-print("Step 8: Generating plots...")
-
-# Plot 1: Frequency deviation (speed) of generator g5
-# This shows how the system frequency responds to the loss of generation
-# Expected: Initial drop followed by recovery due to governor action
-print("  Plotting frequency deviation...")
-ext.getSync('g5').S.plot()
-
-# Plot 2: Governor valve position for generator g5
-# Shows the primary frequency control response
-# Expected: Valve opens to increase mechanical power output
-print("  Plotting governor valve position...")
-ext.getTor('g5').z.plot()
-
-# Plot 3: Mechanical power output of generator g5 (per unit)
-# Shows the turbine response to frequency deviation
-# Expected: Power increases to help restore system frequency
-print("  Plotting mechanical power...")
-ext.getTor('g5').Pm.plot()
-
-# Plot 4: Electrical active power output of generator g5
-# Shows the actual electrical power delivered to the grid
-# Expected: Follows mechanical power with some dynamics
-print("  Plotting electrical active power...")
-ext.getSync('g5').P.plot()
-
-# Plot 5: Terminal voltage magnitude at generator g5
-# Shows voltage stability response
-# Expected: May show voltage drop and recovery, or collapse if system is unstable
-print("  Plotting terminal voltage...")
-ext.getBus('g5').mag.plot()
-
-# Plot 6: Electrical reactive power output of generator g5
-# Shows reactive power dynamics and AVR response
-# Expected: Reactive power may increase to support voltage
-print("  Plotting electrical reactive power...")
-ext.getSync('g5').Q.plot()
-
-print("\n" + "="*80)
-print("SIMULATION COMPLETED SUCCESSFULLY!")
-print("="*80)
 
 # ============================================================================
 # INTERPRETATION GUIDE
@@ -16,9 +16,10 @@ import sys
 from warnings import warn
 
 from .cases import cfg
-from .globals import __runTimeObs__, __which
+from .globals import RAMSESError, __runTimeObs__, __which
 from .simulator import sim
 from .extractor import extractor, curplot, cur
+from .batch import batchSim
 
 if sys.platform in ('win32', 'cygwin'):
     checkGnuplot = __which('gnuplot.exe')
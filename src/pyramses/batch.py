@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Contains the routines to simulate several scenarios of a test-case in parallel with pyramses."""
+
+import copy
+import os
+import warnings
+from multiprocessing import get_context
+
+from .cases import cfg
+from .globals import RAMSESError, CustomWarning
+from .simulator import sim
+
+warnings.showwarning = CustomWarning
+
+
+def _scenarioCase(case, num):
+    """Return a copy of case where the output files are suffixed with the scenario number."""
+    scencase = copy.deepcopy(case)
+    for files in (scencase._out, scencase._init, scencase._cont, scencase._disc, scencase._trj):
+        for i, afile in enumerate(files):
+            root, ext = os.path.splitext(afile)
+            files[i] = '%s_%i%s' % (root, num, ext)
+    return scencase
+
+
+def _runScenario(case, disturbances, t_end):
+    """Simulate one scenario in the current process and return its trajectory file."""
+    ram = sim()
+    ram.execSim(case, 0.0)
+    if disturbances:
+        t_dists, disturbs = zip(*disturbances)
+        ram.addDisturbs(list(t_dists), list(disturbs))
+    ram.contSim(t_end)
+    ram.endSim()
+    return case.getTrj()
+
+
+def batchSim(case, disturbances, t_end, n_workers=None):
+    """Simulate several scenarios of the same case in parallel.
+
+    Each scenario starts from the case description, applies its own disturbances and runs until t_end.
+    The scenarios are distributed over a pool of processes. Every scenario runs in a new process, so that it
+    starts from a freshly loaded instance of RAMSES. The output files of the case (trajectory, output,
+    initialization and trace files) are suffixed with the scenario number, e.g. output.trj becomes
+    output_0.trj, output_1.trj, etc.
+
+    :param case: provides the case description. A trajectory file must be defined.
+    :type case: type(:class:`.cfg`)
+    :param disturbances: one list of (time, description) disturbances per scenario
+    :type disturbances: list of list of (float, str)
+    :param float t_end: time until which each scenario is simulated
+    :param int n_workers: number of processes (optional). Defaults to the number of processors.
+    :returns: the trajectory file of each scenario, or None for the scenarios that failed (a warning gives the
+              error). The failure of a scenario does not affect the others.
+    :rtype: list of str
+
+    :Example:
+
+    >>> import pyramses
+    >>> case = pyramses.cfg("cmd.txt")
+    >>> scenarios = [[(10.0, 'BREAKER SYNC_MACH g%i 0' % i)] for i in range(1, 21)] # trip each generator
+    >>> trjs = pyramses.batchSim(case, scenarios, 150.0)
+    >>> ext = pyramses.extractor(trjs[6])
+
+    .. note:: The processes are started by re-importing the calling script, so the call should be placed under an
+              ``if __name__ == '__main__':`` guard.
+    """
+    if not isinstance(case, cfg):
+        raise TypeError('RAMSES: Function batchSim failed because the case is not of type pyramses.cfg()')
+    if not case.getTrj():
+        raise RAMSESError('RAMSES: Function batchSim needs a trajectory file defined in the case.')
+
+    # maxtasksperchild=1: unloading the library does not reliably reset its global state, so a process
+    # is never reused for a second scenario. The processes are spawned, not forked from this one, which
+    # may have loaded RAMSES already.
+    with get_context('spawn').Pool(processes=n_workers or os.cpu_count(), maxtasksperchild=1) as pool:
+        results = [pool.apply_async(_runScenario, (_scenarioCase(case, num), list(scenario), t_end))
+                   for num, scenario in enumerate(disturbances)]
+
+        trjs = []
+        for num, result in enumerate(results):
+            try:
+                trjs.append(result.get())
+            except Exception as e:
+                warnings.warn('RAMSES: Scenario %i of batchSim failed: %s' % (num, e))
+                trjs.append(None)
+    return trjs
@@ -6,7 +6,7 @@ import os
 import tempfile
 import warnings
 
-from .globals import RAMSESError, __runTimeObs__, CustomWarning, silentremove
+from .globals import RAMSESError, __runTimeObs__, CustomWarning, silentremove, wrapToList
 
 warnings.showwarning = CustomWarning
 
@@ -14,6 +14,19 @@ warnings.showwarning = CustomWarning
 class cfg(object):
     """Test case description class."""
 
+    # file type accepted by addFiles() -> method registering it
+    _addFuncs = {
+        'out': 'addOut',
+        'data': 'addData',
+        'init': 'addInit',
+        'dst': 'addDst',
+        'cont': 'addCont',
+        'disc': 'addDisc',
+        'obs': 'addObs',
+        'trj': 'addTrj',
+        'runobs': 'addRunObs'
+    }
+
     def __init__(self, cmd=None):
         self._out = []  # output file
         self._dataset = []  # data files
@@ -35,9 +48,9 @@ class cfg(object):
                     content = data.read().splitlines()
                     for line in content:
                         # print line
-                        token = line.split()
+                        filled = bool(line) and not line.isspace()  # no need to tokenize the line
                         if typeread == 1:
-                            if len(token) > 0:
+                            if filled:
                                 self.addData(line)
                             else:
                                 if not self._dataset:
@@ -45,45 +58,45 @@ class cfg(object):
                                     return
                                 typeread += 1
                         elif typeread == 2:
-                            if len(token) > 0:
+                            if filled:
                                 self.addInit(line)
                                 typeread += 1
                             else:
                                 typeread += 1
                         elif typeread == 3:
-                            if len(token) > 0:
+                            if filled:
                                 self.addDst(line)
                                 typeread += 1
                             else:
                                 raise Exception('RAMSES: At least one dstfile is necessary in the command file.')
                                 return
                         elif typeread == 4:
-                            if len(token) > 0:
+                            if filled:
                                 self.addTrj(line)
                                 typeread += 1
                             else:
                                 typeread += 2
                         elif typeread == 5:
-                            if len(token) > 0:
+                            if filled:
                                 self.addObs(line)
                                 typeread += 1
                             else:
                                 raise Exception(
                                     'RAMSES: Since a trajectory file was defined, an observable file should be given.')
                         elif typeread == 6:
-                            if len(token) > 0:
+                            if filled:
                                 self.addCont(line)
                                 typeread += 1
                             else:
                                 typeread += 1
                         elif typeread == 7:
-                            if len(token) > 0:
+                            if filled:
                                 self.addDisc(line)
                                 typeread += 1
                             else:
                                 typeread += 1
                         elif typeread == 8:
-                            if len(token) > 0:
+                            if filled:
                                 self.addRunObs(line)
                             else:
                                 typeread += 1
@@ -146,6 +159,31 @@ class cfg(object):
     # def __del__(self):
         # silentremove(self._cmdfile.name)
 
+    def addFiles(self, files):
+        """Register several files of the case at once.
+
+        :param dict files: maps the file type (out, data, init, dst, cont, disc, obs, trj, runobs) to a filename
+                           or a list of filenames. Each entry is passed to the corresponding add method
+                           (e.g. 'data' to :meth:`addData`), in the order given.
+
+        :Example:
+
+        >>> import pyramses
+        >>> case1 = pyramses.cfg()
+        >>> case1.addFiles({'data': ['dyn_A.dat', 'volt_rat_A.dat', 'settings1.dat'],
+        ...                 'dst': 'short.dst',
+        ...                 'obs': 'obs.dat',
+        ...                 'trj': 'output.trj'})
+
+        """
+        for ftype, afiles in files.items():
+            try:
+                addfunc = getattr(self, self._addFuncs[ftype])
+            except KeyError:
+                raise RAMSESError('RAMSES: Function addFiles failed because the file type %s is not valid.' % (ftype))
+            for afile in wrapToList(afiles):
+                addfunc(afile)
+
     def addInit(self, afile):
         """Define the file where the simulation initialization will be saved.
         
@@ -214,7 +252,8 @@ class cfg(object):
         used inside RAMSES. This is mainly used for debugging reasons and it can slow down the execution
         of the simulation.
 
-        :param str afile: the filename. The complete path can be given or a the path relative to the working directory (os.getcwd())
+        :param str afile: the filename. The complete path can be given or a the path relative to the working directory (os.getcwd()).
+                          If None or empty, the continuous trace is not written.
 
         :Example:
 
@@ -225,10 +264,18 @@ class cfg(object):
         .. warning:: If the file already exists, it will be ovewritten without warning!
         """
         del self._cont[:]
+        if not afile:
+            return
         if os.path.isfile(afile):
             warnings.warn('The file %s already exists. It will be overwritten!' % (afile))
         self._cont.append(afile)
 
+    def clearCont(self):
+        """Clear continuous trace file
+
+        """
+        del self._cont[:]
+
     def getCont(self):
         """Return contrinuous trace file
         
@@ -278,7 +325,8 @@ class cfg(object):
         from the discrete controllers, events in the disturbance file, or from discrete variables inside
         the injector, twoport, torque, or exciter models.
 
-        :param str afile: the filename. The complete path can be given or a the path relative to the working directory (os.getcwd())
+        :param str afile: the filename. The complete path can be given or a the path relative to the working directory (os.getcwd()).
+                          If None or empty, the discrete trace is not written.
 
         :Example:
 
@@ -289,6 +337,8 @@ class cfg(object):
         .. warning:: If the file already exists, it will be ovewritten without warning!
         """
         del self._disc[:]
+        if not afile:
+            return
         if os.path.isfile(afile):
             warnings.warn('The file %s already exists. It will be overwritten!' % (afile))
         self._disc.append(afile)
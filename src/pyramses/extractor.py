@@ -4,38 +4,67 @@
 
 import warnings
 import os
+import sys
 import errno
 from scipy.io import FortranFile
 from typing import NamedTuple
 import numpy as np
-import matplotlib.pyplot as plt
 
 from .globals import RAMSESError, CustomWarning, wrapToList
 
 warnings.showwarning = CustomWarning
 
-def curplot(curves):
+def curplot(curves, ax=None):
     """Plots multiple curves
 
     :param list curves: the curves to plot
+    :param ax: the matplotlib axes to plot on (optional). If not given, the curves are plotted in the current
+               figure, which is then shown.
+    :type ax: matplotlib.axes.Axes
 
     """
     curves = wrapToList(curves)
+    if ax is None:
+        import matplotlib.pyplot as plt  # imported on first plot, so that the backend can still be chosen
+        target = plt
+    else:
+        target = ax
     for curve in curves:
-        plt.plot(curve.time, curve.value, label=curve.msg)
-    plt.legend(loc='best',ncol=2)
-    plt.xlabel('time (s)')
-    plt.show()
+        target.plot(curve.time, curve.value, label=curve.msg)
+    target.legend(loc='best',ncol=2)
+    if ax is None:
+        plt.xlabel('time (s)')
+        plt.show()
+    else:
+        ax.set_xlabel('time (s)')
+
+def _nameIndex(names):
+    """Map each name to its position in names, in Fortran notation (first occurrence wins).
+
+    The names are interned, so that lookups with the same string literals mostly compare by identity.
+    """
+    index = {}
+    for i, name in enumerate(names, 1):
+        index.setdefault(sys.intern(name), i)
+    return index
 
 class cur(NamedTuple):
     """Class to save results
+
+    The time array is a view on the results loaded by the extractor. The value array is a view as well for the
+    curves of a single observable, so no copy is made.
     """
     time: np.ndarray
     value: np.ndarray
     msg: str
 
-    def plot(self):
-        curplot(self)
+    @property
+    def values(self):
+        """The timeseries as a numpy array (same as value)."""
+        return self.value
+
+    def plot(self, ax=None):
+        curplot(self, ax)
 
 class extractor(object):
     """The extractor class is used to extract the timeseries data after the simulation and process them. 
@@ -62,7 +91,18 @@ class extractor(object):
             raise FileNotFoundError(errno.ENOENT, 
                                     os.strerror(errno.ENOENT), traj)    
             
-        f = FortranFile(traj, 'r')
+        fp = open(traj, 'rb')
+        if hasattr(os, 'posix_fadvise'):
+            # the file is read once from start to end, let the kernel read ahead more
+            os.posix_fadvise(fp.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        f = FortranFile(fp, 'r')
+        try:
+            self._readTrj(f, traj)
+        finally:
+            f.close()
+
+    def _readTrj(self, f, traj):
+        """Read the header and the samples of the trajectory file traj from the opened FortranFile f."""
         
         self._busnum = f.read_ints()[0]
         self._busname = []
@@ -159,24 +199,66 @@ class extractor(object):
             idxdctl = idxdctl + self._dctlobsnum[i]
         self._addctl.append(idxdctl)
         
+        # name -> position (Fortran notation) of each component, for constant time lookups
+        self._busidx = _nameIndex(self._busname)
+        self._shuidx = _nameIndex(self._shuname)
+        self._ldidx = _nameIndex(self._ldname)
+        self._braidx = _nameIndex(self._braname)
+        self._syncidx = _nameIndex(self._syncname)
+        self._injidx = _nameIndex(self._injname)
+        self._twopidx = _nameIndex(self._twopname)
+        self._dctlidx = _nameIndex(self._dctlname)
+        self._comps = {}  # component objects already returned by the get* methods
+        
+        # shift of the sync machine, exciter and governor observables of all the machines, as arrays
+        # indexed by machine so that a variable can be gathered for all of them at once
+        adexc = np.array(self._adexc, dtype=int)
+        adtor = np.array(self._adtor, dtype=int)
+        self._syncshift = 2*self._busnum+self._shunum+2*self._ldnum+6*self._branum + \
+                          15*np.arange(self._syncnum)+adexc[:-1]-1+adtor[:-1]-1
+        self._excshift = self._syncshift + 15
+        self._torshift = self._syncshift + adexc[1:]-adexc[:-1] + 15
+        
         self._totobs = 2*self._busnum + self._shunum + 2*self._ldnum + 6*self._branum + \
                        15*self._syncnum + sum(self._excobsnum) + sum(self._torobsnum) + \
                        sum(self._injobsnum) + sum(self._twopobsnum) + sum(self._dctlobsnum)
         
-        self._results = []
+        # The samples are copied straight into a column-major array allocated once, so
+        # that the timeseries of each observable (a column) is contiguous in memory and
+        # returned without copy. The file size bounds the number of samples, so the array
+        # never grows. The values of a sample split between two buffers are kept until
+        # the next buffer completes it.
+        ncol = self._totobs+1
+        results = np.empty((os.path.getsize(traj) // (8*ncol), ncol), order='F')
+        nrow = 0
+        rest = np.empty(0)
         buffsz = f.read_ints(np.int64)[0]
         while buffsz > 0:
             temp = f.read_reals(dtype=np.float64)
-            self._results = np.concatenate((self._results, temp))
+            if rest.size:
+                temp = np.concatenate((rest, temp))
+            nfull = temp.size // ncol
+            results[nrow:nrow+nfull] = temp[:nfull*ncol].reshape(nfull, ncol)
+            nrow += nfull
+            rest = temp[nfull*ncol:]
             buffsz = f.read_ints(np.int64)[0]
+        if rest.size:
+            raise RAMSESError('RAMSES: The trajectory file %s ends with an incomplete sample.' % (traj))
         
-        self._results = np.reshape(self._results, (-1,self._totobs+1), order='C')
+        self._results = results[:nrow]
         
         self._time = self._results[:,0]
-        f.close()
  
     def __del__(self):
         warnings.warn("Extractor of file %s was deleted." % self._trajfilename)
+
+    def _memo(self, key, compclass, *args):
+        """Return the component object stored under key, creating it with compclass(*args) on first access."""
+        try:
+            return self._comps[key]
+        except KeyError:
+            comp = self._comps[key] = compclass(*args)
+            return comp
     
     def getBus(self, busname):
         """Returns an object that allows to extract or plot bus related variables.
@@ -197,9 +279,9 @@ class extractor(object):
            obsdesc = ['Voltage magnitude (pu)','Voltage phase angle (deg)']
         """
         try:
-            i=self._busname.index(busname) + 1 # +1 is to go to Fortran notation
-            return self._getBusClass(self._time, self._results, 2*(i-1), busname)
-        except ValueError:
+            i=self._busidx[busname] # already in Fortran notation
+            return self._memo(('Bus', busname), self._getBusClass, self._time, self._results, 2*(i-1), busname)
+        except KeyError:
             warnings.warn('Bus %s not found' % (busname))
     class _getBusClass(object):
         def _getElem(self, j, msg):
@@ -238,9 +320,9 @@ class extractor(object):
         
         """
         try:
-            i=self._shuname.index(shuname) + 1 # +1 is to go to Fortran notation
-            return self._getShuClass(self._time, self._results, 2*self._busnum + i-1, shuname)
-        except ValueError:
+            i=self._shuidx[shuname] # already in Fortran notation
+            return self._memo(('Shu', shuname), self._getShuClass, self._time, self._results, 2*self._busnum + i-1, shuname)
+        except KeyError:
             warnings.warn('Shunt %s not found' % (shuname))
             
     class _getShuClass(object):
@@ -278,9 +360,9 @@ class extractor(object):
            obsdesc = ['Active power consumed (MW)','Reactive power consumed (Mvar)']
         """
         try:
-            i=self._ldname.index(ldname) + 1 # +1 is to go to Fortran notation
-            return self._getLdClass(self._time, self._results, 2*self._busnum+self._shunum +2*(i-1), ldname)
-        except ValueError:
+            i=self._ldidx[ldname] # already in Fortran notation
+            return self._memo(('Ld', ldname), self._getLdClass, self._time, self._results, 2*self._busnum+self._shunum +2*(i-1), ldname)
+        except KeyError:
             warnings.warn('Load %s not found' % (ldname))
             
     class _getLdClass(object):
@@ -321,11 +403,11 @@ class extractor(object):
         
         """
         try:
-            i=self._braname.index(braname) + 1 # +1 is to go to Fortran notation
-            return self._getBraClass(self._time, self._results, 2*self._busnum+
+            i=self._braidx[braname] # already in Fortran notation
+            return self._memo(('Bra', braname), self._getBraClass, self._time, self._results, 2*self._busnum+
                                  self._shunum+2*self._ldnum+6*(i-1), braname)
-        except ValueError:
-            warnings.warn('Branch %s not found' % (ldnabranameme))
+        except KeyError:
+            warnings.warn('Branch %s not found' % (braname))
             
     class _getBraClass(object):
         def _getElem(self, j, msg):
@@ -378,25 +460,40 @@ class extractor(object):
                     'speed of COI reference (pu)               ']
         """
         try:
-            i=self._syncname.index(syncname) + 1 # +1 is to go to Fortran notation
-            return self._getSyncClass(self._time, self._results, 
-                                  2*self._busnum+self._shunum+2*self._ldnum+6*self._branum+
-                                  15*(i-1)+self._adexc[i-1]-1+self._adtor[i-1]-1, syncname)
-        except ValueError:
+            i=self._syncidx[syncname] # already in Fortran notation
+            return self._memo(('Sync', syncname), self._getSyncClass, self._time, self._results, 
+                                  int(self._syncshift[i-1]), syncname)
+        except KeyError:
             warnings.warn('Sync machine %s not found' % (syncname))
         
-    class _getSyncClass(object):
-        def _getElem(self, j, msg):
-            tmp = self._shift + j
-            return cur(self._time, self._results[:,tmp], msg)
+    def getAllSync(self, obsname):
+        """Returns a variable of all the synchronous machines at once.
         
-        def __init__(self, time, results, shift, syncname):
-            self._time = time
-            self._results = results
-            self._shift = shift
-            j=0
-            self._obsnames = ['P','Q','A','S','FW','DD','QD','QW','FC','FV','T','ET','SC']
-            self._obsdesc = ['active power produced (MW)',
+        :param str obsname: the name of the variable, as in :meth:`getSync`
+        :returns: a curve whose value has one column per machine, in the order in which the machines appear in the
+                  trajectory file. Unlike the curves of :meth:`getSync`, the value is a copy of the results.
+        :rtype: :class:`cur`
+
+        :Example:
+
+        >>> import pyramses
+        >>> case = pyramses.cfg("case.rcfg") # load case from a configuration file
+        >>> ram = pyramses.sim()
+        >>> ram.execSim(case) # run the simulation
+        >>> ext = pyramses.extractor(case.getTrj())
+        >>> ext.getAllSync('S').value.mean(axis=1) # average rotor speed of the machines
+        """
+        try:
+            j=self._getSyncClass._obsnames.index(obsname) + 1 # +1 is to go to Fortran notation
+        except ValueError:
+            warnings.warn('Sync machine variable %s not found' % (obsname))
+            return
+        return cur(self._time, self._results[:,self._syncshift + j],
+                   'all sync machines: '+self._getSyncClass._obsdesc[j-1])
+        
+    class _getSyncClass(object):
+        _obsnames = ['P','Q','A','S','FW','DD','QD','QW','FC','FV','T','ET','SC']
+        _obsdesc = ['active power produced (MW)',
                     'reactive power produced (Mvar)',
                     'rotor angle wrt COI (deg)',
                     'rotor speed (pu)',
@@ -409,6 +506,16 @@ class extractor(object):
                     'mechanical torque (pu)                    ',
                     'electromagnetic torque (pu mach. base)    ',
                     'speed of COI reference (pu)               ']
+        
+        def _getElem(self, j, msg):
+            tmp = self._shift + j
+            return cur(self._time, self._results[:,tmp], msg)
+        
+        def __init__(self, time, results, shift, syncname):
+            self._time = time
+            self._results = results
+            self._shift = shift
+            j=0
             self.obsdict = dict(zip(self._obsnames, self._obsdesc))
             for name,msg in zip(self._obsnames, self._obsdesc):
                 j=j+1
@@ -429,11 +536,10 @@ class extractor(object):
         >>> ext.getExc('g1').vf.plot() # will plot the timeseries simulated for the field voltage of 'g1' 
         """
         try:
-            i=self._syncname.index(syncname) + 1 # +1 is to go to Fortran notation
-            return self._getExcClass(self._time, self._results, 
-                                  2*self._busnum+self._shunum+2*self._ldnum+6*self._branum+
-                                  15*(i-1)+self._adexc[i-1]-1+self._adtor[i-1]-1 + 15, self._excobsname[i-1], syncname)
-        except ValueError:
+            i=self._syncidx[syncname] # already in Fortran notation
+            return self._memo(('Exc', syncname), self._getExcClass, self._time, self._results, 
+                                  int(self._excshift[i-1]), self._excobsname[i-1], syncname)
+        except KeyError:
             warnings.warn('Sync machine %s not found' % (syncname))
         
     class _getExcClass(object):
@@ -466,11 +572,10 @@ class extractor(object):
         >>> ext.getTor('g1').Tm.plot() # will plot the timeseries simulated for the torque of 'g1' 
         """
         try:
-            i=self._syncname.index(syncname) + 1 # +1 is to go to Fortran notation
-            return self._getTorClass(self._time, self._results, 
-                                  2*self._busnum+self._shunum+2*self._ldnum+6*self._branum+
-                                  15*(i-1)+self._adexc[i]-1+self._adtor[i-1]-1 + 15, self._torobsname[i-1], syncname)
-        except ValueError:
+            i=self._syncidx[syncname] # already in Fortran notation
+            return self._memo(('Tor', syncname), self._getTorClass, self._time, self._results, 
+                                  int(self._torshift[i-1]), self._torobsname[i-1], syncname)
+        except KeyError:
             warnings.warn('Sync machine %s not found' % (syncname))
         
     class _getTorClass(object):
@@ -504,13 +609,13 @@ class extractor(object):
         >>> ext.getInj('pv1').P.plot() # will plot the timeseries simulated for the active power of 'pv1' 
         """
         try:
-            i=self._injname.index(injname) + 1 # +1 is to go to Fortran notation
-            return self._getInjClass(self._time, self._results, 
+            i=self._injidx[injname] # already in Fortran notation
+            return self._memo(('Inj', injname), self._getInjClass, self._time, self._results, 
                                  2*self._busnum+self._shunum+2*self._ldnum+6*self._branum+
                                  15*(self._syncnum)+self._adexc[self._syncnum]-1+
                                  self._adtor[self._syncnum]-1+self._adinj[i-1]-1, 
                                  self._injobsname[i-1], injname)
-        except ValueError:
+        except KeyError:
             warnings.warn('Injector %s not found' % (injname))
         
     class _getInjClass(object):
@@ -544,14 +649,14 @@ class extractor(object):
         >>> ext.getTwop('lcc1').P1.plot() # will plot the timeseries simulated for the power of 'lcc1' 
         """
         try:
-            i=self._twopname.index(twopname) + 1 # +1 is to go to Fortran notation
-            return self._getTwopClass(self._time, self._results, 
+            i=self._twopidx[twopname] # already in Fortran notation
+            return self._memo(('Twop', twopname), self._getTwopClass, self._time, self._results, 
                                  2*self._busnum+self._shunum+2*self._ldnum+6*self._branum+
                                  15*(self._syncnum)+self._adexc[self._syncnum]-1+
                                  self._adtor[self._syncnum]-1+self._adinj[self._injnum]-1+
                                  self._adtwop[i-1]-1, 
                                  self._twopobsname[i-1], twopname)
-        except ValueError:
+        except KeyError:
             warnings.warn('Twoport %s not found' % (twopname))
         
     class _getTwopClass(object):
@@ -585,14 +690,14 @@ class extractor(object):
         >>> ext.getDctl('agc').g5.plot() # will plot the timeseries simulated for the power of 'g5' 
         """
         try:
-            i=self._dctlname.index(dctlname) + 1 # +1 is to go to Fortran notation
-            return self._getDCTLClass(self._time, self._results, 
+            i=self._dctlidx[dctlname] # already in Fortran notation
+            return self._memo(('DCTL', dctlname), self._getDCTLClass, self._time, self._results, 
                                  2*self._busnum+self._shunum+2*self._ldnum+6*self._branum+
                                  15*(self._syncnum)+self._adexc[self._syncnum]-1+
                                  self._adtor[self._syncnum]-1+self._adinj[self._injnum]-1+
                                  self._adtwop[self._twopnum]-1+self._addctl[i-1]-1, 
                                  self._dctlobsname[i-1],dctlname)
-        except ValueError:
+        except KeyError:
             warnings.warn('DCTL %s not found' % (dctlname))
         
     class _getDCTLClass(object):
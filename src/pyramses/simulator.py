@@ -21,6 +21,7 @@ class sim(object):
     warnings.showwarning = CustomWarning
 
     ramsesCount = 0  # Provides a sum of all instances of Ramses running
+    _cdecls = None  # Call types parsed from ramses.h, shared by all instances
     os.environ["KMP_DUPLICATE_LIB_OK"] = "TRUE"  # This allows to run even if 2 versions of MKL are present on the computer
 
     # print(__libdir__)
@@ -64,8 +65,9 @@ class sim(object):
             _ctypes.dlclose(self._ramseslib._handle)
         sim.ramsesCount -= 1
 
-    def _c_func_wrapper(self, cdecl_text):
-        """Read the ramses.h file and sets the necessary call types for Python."""
+    @staticmethod
+    def _c_func_decl(cdecl_text):
+        """Parse a declaration of the ramses.h file and return the name, return type and argument types for Python."""
 
         def move_pointer_and_strip(type_def, name):
             if '*' in name:
@@ -102,27 +104,32 @@ class sim(object):
             if param != 'void':
                 param_spec.append(move_pointer_and_strip(*param.rsplit(' ', 1)))
 
-        try:
-            func = getattr(self._ramseslib, name)  # get the function from the dll
-            setattr(func, 'restype', type_lookup(rtn_type))  # set the return type
-            setattr(func, 'argtypes', [type_lookup(type_def) for type_def, _ in param_spec])  # set the argument types
-        except AttributeError as e:
-            #raise AttributeError(
-            #    'RAMSES: Function %s is listed in ramses.h but cannot be found in the library.' % (name), e)
-            warnings.warn('RAMSES: Function %s is listed in ramses.h but cannot be found in the library.' % (name))
-            print(e)
+        return name, type_lookup(rtn_type), [type_lookup(type_def) for type_def, _ in param_spec]
 
     def _setcalls(self):
-        """Define the argument types and returning types for the routines in RAMSES"""
-        try:
-            with open(os.path.join(__libdir__, "ramses.h"), 'r') as f:
-                _C_HEADER = f.read()
-                for cdecl_text in _C_HEADER.splitlines():
-                    if cdecl_text.strip():
-                        if not cdecl_text.startswith("//"):
-                            self._c_func_wrapper(cdecl_text)
-        except IOError as e:
-            raise IOError("RAMSES: Cannot open ramses.h files", e)
+        """Define the argument types and returning types for the routines in RAMSES
+
+        The ramses.h file is read and parsed only once, the first time a simulator is created.
+        """
+        if sim._cdecls is None:
+            try:
+                with open(os.path.join(__libdir__, "ramses.h"), 'r') as f:
+                    _C_HEADER = f.read()
+            except IOError as e:
+                raise IOError("RAMSES: Cannot open ramses.h files", e)
+            sim._cdecls = [self._c_func_decl(cdecl_text) for cdecl_text in _C_HEADER.splitlines()
+                           if cdecl_text.strip() and not cdecl_text.startswith("//")]
+
+        for name, restype, argtypes in sim._cdecls:
+            try:
+                func = getattr(self._ramseslib, name)  # get the function from the dll
+                setattr(func, 'restype', restype)  # set the return type
+                setattr(func, 'argtypes', argtypes)  # set the argument types
+            except AttributeError as e:
+                #raise AttributeError(
+                #    'RAMSES: Function %s is listed in ramses.h but cannot be found in the library.' % (name), e)
+                warnings.warn('RAMSES: Function %s is listed in ramses.h but cannot be found in the library.' % (name))
+                print(e)
 
     def getLastErr(self):
         """Return the last error message issued by RAMSES.
@@ -172,37 +179,21 @@ class sim(object):
         if (retval != 0) and (retval != 112):
             raise RAMSESError('RAMSES: Function get_Jac failed.')
         
-        Nmat = 0
         try:
-            f = open('py_eqs.dat','r')
-            lines = f.readlines()
-            f.close()
-            rowl = []
-            coll = []
-            datal = []
-            for x in lines:
-                xsplit = x.split()
-                if int(xsplit[0]) > Nmat:
-                    Nmat = int(xsplit[0])
-                if int(xsplit[5]) > 0:
-                    rowl.append(int(xsplit[0])-1)
-                    coll.append(int(xsplit[5])-1)
-                    datal.append(1)
-            row = np.array( rowl, dtype=int )
-            col = np.array( coll, dtype=int )
-            data = np.array( datal, dtype=float )
-            E = coo_matrix((data,(row,col)), shape=(Nmat,Nmat)).tocsc()
+            # only the equation number (1st) and the differential variable (6th) columns are needed
+            eqs = np.loadtxt('py_eqs.dat', dtype=int, usecols=(0, 5), ndmin=2)
+            Nmat = eqs[:, 0].max(initial=0)
+            diff = eqs[eqs[:, 1] > 0] - 1  # go to Python notation
+            data = np.ones(diff.shape[0], dtype=float)
+            E = coo_matrix((data,(diff[:, 0],diff[:, 1])), shape=(Nmat,Nmat)).tocsc()
         except:
             raise RAMSESError('RAMSES: Function get_Jac failed while reading E.')
             
         try:
-            f = open('py_val.dat','r')
-            lines = f.readlines()
-            f.close()
-            row = np.array( [ int(x.split()[0])-1 for x in lines ], dtype=int )
-            col = np.array( [ int(x.split()[1])-1 for x in lines ], dtype=int )
-            data = np.array( [ x.split()[2] for x in lines ], dtype=float )
-            A = coo_matrix((data,(row,col)), shape=(Nmat,Nmat)).tocsc()
+            # row, column and value of each entry are read together in a single pass over the file
+            vals = np.loadtxt('py_val.dat', dtype=[('row', int), ('col', int), ('val', float)],
+                              usecols=(0, 1, 2), ndmin=1)
+            A = coo_matrix((vals['val'],(vals['row']-1,vals['col']-1)), shape=(Nmat,Nmat)).tocsc()
         except:
             raise RAMSESError('RAMSES: Function get_Jac failed while reading A.')
 
@@ -857,6 +848,44 @@ class sim(object):
         """
         return self._ramseslib.add_disturb(t_dist, disturb.encode('utf-8'))
 
+    def addDisturbs(self, t_dists, disturbs):
+        """Add several disturbances at once. Each one follows the same structure as the disturbances in the dst files.
+
+        The disturbances are passed to RAMSES in chronological order. The arguments are checked before any
+        disturbance is passed, but if RAMSES rejects one of them, the disturbances passed before it stay queued.
+
+        :param t_dists: times of the disturbances
+        :type t_dists: list of float or numpy.ndarray
+        :param disturbs: descriptions of the disturbances
+        :type disturbs: list of str or any iterable of str
+
+        :Example:
+
+        >>> import pyramses
+        >>> ram = pyramses.sim()
+        >>> case = pyramses.cfg("cmd.txt")
+        >>> ram.execSim(case, 80.0) # simulate until 80 seconds and pause
+        >>> t_dists = [100.000, 100.000, 120.000]
+        >>> disturbs = ['CHGPRM DCTL 1-1041  Vsetpt -0.05 0',
+        ...             'CHGPRM DCTL 2-1042  Vsetpt -0.05 0',
+        ...             'BREAKER SYNC_MACH g7 0']
+        >>> ram.addDisturbs(t_dists, disturbs)
+        >>> ram.contSim(ram.getInfTime()) # continue the simulation
+        """
+        t_dists = np.atleast_1d(np.asarray(t_dists, dtype=np.float64))
+        if isinstance(disturbs, str):
+            disturbs = [disturbs]
+        disturbs = [disturb.encode('utf-8') for disturb in disturbs]
+
+        if len(t_dists) != len(disturbs):
+            raise ValueError('RAMSES: Function addDisturbs failed because the lists are not equal!')
+        for i in np.argsort(t_dists, kind='stable'):
+            retval = self._ramseslib.add_disturb(t_dists[i], disturbs[i])
+            if retval != 0:
+                raise RAMSESError(
+                    'RAMSES: Function addDisturbs(%f,%s) failed with the flag %i. Last message was: %s'
+                    % (t_dists[i], disturbs[i].decode(), retval, self.getLastErr()))
+
     def load_MDL(MDLName):
         """Load external DLL file with user defined models. Should be in current directory or absolute path.
 
@@ -0,0 +1,138 @@
+"""Tests for pyramses.batchSim with a fake simulator in place of the RAMSES library."""
+
+import pytest
+
+import pyramses
+from pyramses import batch
+from pyramses.simulator import sim
+
+
+class FakeLib(object):
+    """Stands for the RAMSES library, records the disturbances it receives."""
+
+    def __init__(self):
+        self.disturbs = []
+
+    def add_disturb(self, t_dist, disturb):
+        if disturb == b'FAIL':
+            return 1
+        self.disturbs.append((float(t_dist), disturb.decode()))
+        return 0
+
+    def get_last_err_log(self, msg):
+        return 0
+
+
+class FakeSim(sim):
+    """Simulator running on FakeLib, keeps track of its instances."""
+
+    instances = []
+
+    def __init__(self):
+        self._ramseslib = FakeLib()
+        self.case = None
+        self.t_end = None
+        FakeSim.instances.append(self)
+
+    def __del__(self):
+        pass
+
+    def execSim(self, cmd, pause=None):
+        self.case = cmd
+
+    def contSim(self, pause=None):
+        self.t_end = pause
+
+    def endSim(self):
+        pass
+
+
+class InlineResult(object):
+    """Result of a task run by InlinePool."""
+
+    def __init__(self, value=None, error=None):
+        self._value = value
+        self._error = error
+
+    def get(self):
+        if self._error is not None:
+            raise self._error
+        return self._value
+
+
+class InlinePool(object):
+    """Runs the submitted tasks immediately in the current process."""
+
+    method = None
+    kwargs = None
+
+    def __init__(self, **kwargs):
+        InlinePool.kwargs = kwargs
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def apply_async(self, fn, args):
+        try:
+            return InlineResult(value=fn(*args))
+        except Exception as e:
+            return InlineResult(error=e)
+
+
+class InlineContext(object):
+    """Multiprocessing context handing out InlinePool."""
+
+    Pool = InlinePool
+
+
+def get_context(method):
+    InlinePool.method = method
+    return InlineContext
+
+
+@pytest.fixture
+def fakesim(monkeypatch):
+    FakeSim.instances = []
+    monkeypatch.setattr(batch, 'sim', FakeSim)
+    monkeypatch.setattr(batch, 'get_context', get_context)
+    return FakeSim
+
+
+@pytest.fixture
+def case(tmp_path):
+    case = pyramses.cfg()
+    case.addTrj(str(tmp_path / 'output.trj'))
+    case.addOut(str(tmp_path / 'output.trace'))
+    return case
+
+
+def test_runScenario_applies_disturbances(fakesim, case):
+    trj = batch._runScenario(case, [(20.0, 'BREAKER SYNC_MACH g1 0'), (10.0, 'BREAKER SYNC_MACH g7 0')], 150.0)
+
+    ram, = fakesim.instances
+    assert trj == case.getTrj()
+    assert ram.case is case
+    assert ram.t_end == 150.0
+    assert ram._ramseslib.disturbs == [(10.0, 'BREAKER SYNC_MACH g7 0'), (20.0, 'BREAKER SYNC_MACH g1 0')]
+
+
+def test_batchSim_runs_each_scenario(fakesim, case, tmp_path):
+    scenarios = [[(10.0, 'BREAKER SYNC_MACH g7 0')], [], [(5.0, 'FAIL')]]
+
+    with pytest.warns(UserWarning, match='Scenario 2'):
+        trjs = pyramses.batchSim(case, scenarios, 100.0, n_workers=2)
+
+    assert trjs == [str(tmp_path / 'output_0.trj'), str(tmp_path / 'output_1.trj'), None]
+    assert InlinePool.method == 'spawn'
+    assert InlinePool.kwargs == {'processes': 2, 'maxtasksperchild': 1}
+    assert [ram._ramseslib.disturbs for ram in fakesim.instances] == [[(10.0, 'BREAKER SYNC_MACH g7 0')], [], []]
+    assert fakesim.instances[1].case.getOut() == str(tmp_path / 'output_1.trace')
+    assert case.getTrj() == str(tmp_path / 'output.trj')  # the given case is left untouched
+
+
+def test_batchSim_needs_trajectory(fakesim):
+    with pytest.raises(pyramses.RAMSESError):
+        pyramses.batchSim(pyramses.cfg(), [[]], 100.0)